@@ -1,10 +1,16 @@
 import streamlit as st
+import altair as alt
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
-import matplotlib.dates as mdates
+from matplotlib.figure import Figure
 from pathlib import Path
 
+try:
+    from numba import njit
+except ImportError:  # numba opsional; tanpa numba pakai bincount NumPy
+    njit = None
+
 # CONFIG DASAR 
 st.set_page_config(page_title="Visualisasi Data COVID-19", layout="wide")
 st.markdown(
@@ -20,145 +26,390 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-plt.rcParams.update({
-    "axes.titlesize": 10,
-    "axes.labelsize": 8,
-    "xtick.labelsize": 7,
-    "ytick.labelsize": 7,
-    "legend.fontsize": 7
-})
+# rcParams berlaku proses-wide; cukup di-set sekali, bukan tiap rerun
+if not st.session_state.get("_init"):
+    plt.rcParams.update({
+        "axes.titlesize": 10,
+        "axes.labelsize": 8,
+        "xtick.labelsize": 7,
+        "ytick.labelsize": 7,
+        "legend.fontsize": 7
+    })
+    st.session_state["_init"] = True
+
+# Hanya kolom yang benar-benar dipakai aplikasi (dataset aslinya ~37 kolom)
+USECOLS = ["Date", "Province", "New Cases", "New Deaths", "New Recovered",
+           "Total Cases", "Total Deaths", "Total Recovered", "Total Active Cases"]
+DTYPES = {
+    "Province": "category",
+    "New Cases": "int32",
+    "New Deaths": "int32",
+    "New Recovered": "int32",
+    "Total Cases": "int64",
+    "Total Deaths": "int64",
+    "Total Recovered": "int64",
+    "Total Active Cases": "int64",
+}
 
-# LOAD DATA 
-@st.cache_data
+# LOAD DATA
+# cache_resource: satu objek dibagikan lintas rerun/sesi tanpa deep-copy
+# seperti cache_data — konsekuensinya df TIDAK BOLEH dimutasi di bawah;
+# turunan yang diubah (sort, reset_index, dsb.) harus berupa salinan lokal
+@st.cache_resource(show_spinner=False)
 def load_data():
     fp = Path("covid_19_indonesia_clean.csv")
-    if not fp.exists():
-        st.stop("❌ File 'covid_19_indonesia_clean.csv' tidak ditemukan.")
-    df = pd.read_csv(fp)
-    if "Date" not in df.columns:
-        st.stop("❌ Kolom 'Date' tidak ada di dataset.")
-    df["Date"] = pd.to_datetime(df["Date"])
+    pq = fp.with_suffix(".parquet")
+    if pq.exists():
+        df = pd.read_parquet(pq, engine="pyarrow")
+    else:
+        if not fp.exists():
+            st.stop("❌ File 'covid_19_indonesia_clean.csv' tidak ditemukan.")
+        try:
+            # Engine pyarrow mem-parse CSV multi-thread; jauh lebih cepat
+            # dari engine C default untuk cold start pertama
+            df = pd.read_csv(fp, usecols=USECOLS, dtype=DTYPES,
+                             parse_dates=["Date"], engine="pyarrow")
+        except (ImportError, ValueError):
+            df = pd.read_csv(fp, usecols=USECOLS, dtype=DTYPES, parse_dates=["Date"])
+        try:
+            df.to_parquet(pq, compression="zstd", index=False)
+        except (ImportError, OSError):
+            pass  # tanpa pyarrow / folder read-only: tetap jalan dari CSV
+    # Kode kategori integer mempercepat isin/groupby/== dibanding kolom object
+    df["Province"] = df["Province"].astype("category")
+    # DatetimeIndex terurut (tanpa tz): slicing tanggal cukup binary search
+    # dan groupby per tanggal memakai jalur grouper index yang cepat
+    df = df.set_index("Date").sort_index()
     return df
 
 df = load_data()
 
+HOT_COLS = ["Total Cases", "Total Deaths", "Total Recovered"]
+
+@st.cache_resource(show_spinner=False)
+def load_arrays():
+    """Kolom panas sebagai array NumPy kontigu (SoA) untuk jalur agregasi."""
+    frame = load_data()
+    days = frame.index.values.astype("datetime64[D]")
+    return {
+        "codes": frame["Province"].cat.codes.to_numpy(np.int16),
+        "vals": np.ascontiguousarray(frame[HOT_COLS].to_numpy(np.int64)),
+        "dates": frame.index.values,  # datetime64[ns], monoton naik
+        "day_codes": (days - days[0]).astype(np.int64),  # hari ke-n sejak awal
+        "day0": days[0],
+    }
+
+if njit is not None:
+    @njit(cache=True)
+    def _daily_sum(day_codes, values, n_days):
+        out = np.zeros(n_days, np.int64)
+        for i in range(values.shape[0]):
+            out[day_codes[i]] += values[i]
+        return out
+else:
+    def _daily_sum(day_codes, values, n_days):
+        return np.bincount(day_codes, weights=values, minlength=n_days).astype(np.int64)
+
+@st.cache_resource(show_spinner=False)
+def province_list():
+    """Daftar provinsi (sudah terurut dari kategori), dibangun sekali saja."""
+    return df["Province"].cat.categories.tolist()
+
+def date_slice(start, end):
+    """Potong df pada rentang tanggal inklusif; .loc pada DatetimeIndex
+    terurut turun ke binary search, tanpa mask boolean sepanjang N."""
+    return df.loc[start:end]
+
 st.title("🦠 Visualisasi Data COVID-19 Indonesia per Provinsi")
 
 if "Province" not in df.columns:
     st.stop("❌ Kolom 'Province' tidak ada di dataset.")
 
 # SIDEBAR 
-provinsi_list = sorted(df["Province"].dropna().unique())
+provinsi_list = province_list()
 provinces = st.sidebar.multiselect("Pilih provinsi:", provinsi_list, default=provinsi_list[:3])
 
 st.sidebar.header("📅 Filter Tanggal")
-min_date, max_date = df["Date"].min().date(), df["Date"].max().date()
+min_date, max_date = df.index[0].date(), df.index[-1].date()
 start_date = st.sidebar.date_input("Dari tanggal", value=min_date, min_value=min_date, max_value=max_date)
 end_date = st.sidebar.date_input("Sampai tanggal", value=max_date, min_value=min_date, max_value=max_date)
 
 if start_date > end_date:
     st.sidebar.error("❌ 'Dari tanggal' tidak boleh melebihi 'Sampai tanggal'.")
 
+# Tanpa provinsi terpilih / rentang tidak valid: berhenti di sini saja,
+# jangan jalankan seluruh pipeline agregasi dan grafik untuk frame kosong
+if not provinces or start_date > end_date:
+    st.info("ℹ️ Pilih minimal satu provinsi dan rentang tanggal yang valid.")
+    st.stop()
+
 # FILTER DATA 
-mask_tgl = (df["Date"].dt.date >= start_date) & (df["Date"].dt.date <= end_date)
-mask_prov = df["Province"].isin(provinces)
-filtered_df = df[mask_tgl & mask_prov]
+date_df = date_slice(start_date, end_date)
+filtered_df = date_df[date_df["Province"].isin(provinces)]
+
+# Agregat "nilai terakhir per provinsi" dihitung sekali per kombinasi filter,
+# lalu dipakai ulang oleh bar/scatter/pie di bawah (tuple agar bisa di-hash).
+# Dihitung langsung di atas array SoA: satu stable-sort atas kode provinsi
+# (urutan tanggal di dalam grup terjaga) lalu ambil elemen terakhir tiap run.
+@st.cache_data(show_spinner=False)
+def latest_per_province(start, end, provinces_key):
+    arr = load_arrays()
+    lo, hi = np.searchsorted(
+        arr["dates"], [np.datetime64(start), np.datetime64(end) + np.timedelta64(1, "D")]
+    )
+    codes = arr["codes"][lo:hi]
+    if codes.size:
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        last_idx = np.append(np.flatnonzero(np.diff(sorted_codes)), sorted_codes.size - 1)
+        cats = df["Province"].cat.categories
+        res = pd.DataFrame(arr["vals"][lo:hi][order[last_idx]],
+                           index=cats[sorted_codes[last_idx]], columns=HOT_COLS)
+    else:
+        res = pd.DataFrame(columns=HOT_COLS)
+    res.index.name = "Province"
+    return res.reindex(list(provinces_key))
+
+@st.cache_data(show_spinner=False)
+def national_daily_total(start, end, provinces_key):
+    """Total kasus nasional per hari via kernel penjumlahan ter-kompilasi."""
+    arr = load_arrays()
+    lo, hi = np.searchsorted(
+        arr["dates"], [np.datetime64(start), np.datetime64(end) + np.timedelta64(1, "D")]
+    )
+    cats = df["Province"].cat.categories
+    sel = cats.get_indexer(list(provinces_key))
+    mask = np.isin(arr["codes"][lo:hi], sel)
+    day_codes = arr["day_codes"][lo:hi][mask]
+    totals = arr["vals"][lo:hi, 0][mask]
+    if day_codes.size == 0:
+        return pd.Series(dtype=np.int64, name="Total Cases")
+    offset = day_codes[0]
+    out = _daily_sum(day_codes - offset, totals, int(day_codes[-1] - offset) + 1)
+    present = np.unique(day_codes)  # hanya hari yang punya data, seperti groupby
+    idx = pd.DatetimeIndex(arr["day0"] + present)
+    return pd.Series(out[present - offset], index=idx, name="Total Cases")
+
+@st.cache_data(show_spinner=False)
+def corr_matrix(start, end, provinces_key, cols_key):
+    sub = date_slice(start, end)
+    sub = sub[sub["Province"].isin(provinces_key)][list(cols_key)].dropna()
+    return sub.corr()
+
+latest = latest_per_province(start_date, end_date, tuple(provinces))
+
+# GRAFIK
+# Figure di-cache sebagai resource (tanpa copy/pickle) dengan kunci tuple
+# immutable dari datanya, jadi rerun dengan filter sama memakai Figure lama.
+# Konsekuensinya st.pyplot dipanggil dengan clear_figure=False.
+# Figure dibuat langsung (bukan plt.subplots) supaya tidak terdaftar di
+# registry global pyplot — tanpa plt.close() registry itu menahan referensi
+# tiap figure selamanya; max_entries membatasi umur cache per builder.
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_pie_fig(labels, values):
+    import seaborn as sns  # impor malas: hanya dibayar saat pie dirender
+    fig = Figure(figsize=(2.8, 2.8))
+    ax = fig.add_subplot()
+    ax.pie(values, labels=labels, autopct="%1.1f%%", startangle=140,
+           colors=sns.color_palette("Pastel1", n_colors=len(values)), shadow=True, textprops={'fontsize': 7})
+    ax.set_title("Proporsi Total Kasus", fontsize=9)
+    ax.axis("equal")
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_pie_rec_fig(labels, values):
+    import seaborn as sns
+    fig = Figure(figsize=(2.8, 2.8))
+    ax = fig.add_subplot()
+    wedges, texts, autotexts = ax.pie(values, labels=labels, autopct='%1.1f%%',
+                                      startangle=140, explode=[0.05]*len(values),
+                                      colors=sns.color_palette("Set3", n_colors=len(values)),
+                                      shadow=True, textprops={'fontsize': 7})
+    for autotext in autotexts:
+        autotext.set_color('black')
+        autotext.set_fontweight('bold')
+    ax.set_title("Proporsi Total Pasien Sembuh", fontsize=9, color="#388E3C")
+    ax.axis("equal")
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_heatmap_fig(cols_key, corr_key):
+    # imshow + anotasi manual: jauh lebih ringan dari sns.heatmap untuk
+    # matriks korelasi sekecil ini, dan tanpa menyentuh Seaborn sama sekali
+    corr = np.array(corr_key)
+    n = len(cols_key)
+    fig = Figure(figsize=(3.5, 2.5))
+    ax = fig.add_subplot()
+    im = ax.imshow(corr, cmap="YlGnBu")
+    ax.set_xticks(range(n))
+    ax.set_xticklabels(cols_key, rotation=45, ha="right", fontsize=6)
+    ax.set_yticks(range(n))
+    ax.set_yticklabels(cols_key, fontsize=6)
+    mid = (np.nanmax(corr) + np.nanmin(corr)) / 2
+    for i in range(n):
+        for j in range(n):
+            ax.text(j, i, f"{corr[i, j]:.2f}", ha="center", va="center", fontsize=6,
+                    color="white" if corr[i, j] > mid else "black")
+    fig.colorbar(im, ax=ax)
+    fig.tight_layout()
+    return fig
+
+# Bar/scatter/area memakai chart native Streamlit: server cukup
+# serialisasi beberapa baris agregat, rendering terjadi di browser
+def render_bar():
+    bar_data = latest["Total Cases"].fillna(0)
+    if not bar_data.empty:
+        st.bar_chart(bar_data, color="#FFB74D")
+
+def render_scatter():
+    if {"Total Cases", "Total Deaths"}.issubset(filtered_df.columns):
+        # Konvensi modul ini: kolom turunan dibuat elementwise lewat assign,
+        # agregasi memakai reducer bawaan — hindari groupby.apply(lambda)
+        scat_df = (latest[["Total Cases", "Total Deaths"]].dropna()
+                   .assign(CFR=lambda d: (d["Total Deaths"]
+                                          / d["Total Cases"].clip(lower=1)).round(4)))
+        if not scat_df.empty:
+            chart = (alt.Chart(scat_df.reset_index())
+                     .mark_circle(size=60, color="#64B5F6")
+                     .encode(x="Total Cases", y="Total Deaths",
+                             tooltip=["Province", "Total Cases", "Total Deaths", "CFR"]))
+            st.altair_chart(chart, use_container_width=True)
+
+def render_pie():
+    pie_df = latest["Total Cases"].dropna()
+    if not pie_df.empty:
+        fig = build_pie_fig(tuple(pie_df.index), tuple(pie_df.values))
+        st.pyplot(fig, clear_figure=False)
+
+def render_area():
+    if "Total Cases" in filtered_df.columns:
+        area_df = national_daily_total(start_date, end_date, tuple(provinces))
+        if not area_df.empty:
+            st.area_chart(area_df, color="#E57373")
+
+def render_pie_rec():
+    if {"Province", "Total Recovered"}.issubset(filtered_df.columns):
+        pie_rec_df = latest["Total Recovered"].dropna()
+        if not pie_rec_df.empty:
+            fig = build_pie_rec_fig(tuple(pie_rec_df.index), tuple(pie_rec_df.values))
+            st.pyplot(fig, clear_figure=False)
+
+def render_heatmap():
+    cols = [c for c in ["New Cases", "New Deaths", "New Recovered", "Total Cases",
+                        "Total Deaths", "Total Recovered", "Total Active Cases"] if c in filtered_df.columns]
+    if len(cols) >= 2:
+        corr = corr_matrix(start_date, end_date, tuple(provinces), tuple(cols))
+        if not corr.isna().all().all():
+            fig = build_heatmap_fig(tuple(cols), tuple(map(tuple, corr.values)))
+            st.pyplot(fig, clear_figure=False)
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_compact_fig(bar_key, scat_key, pie_key, area_key):
+    """Satu Figure 2x2 untuk mode ringkas: satu konstruksi, satu transfer."""
+    import matplotlib.dates as mdates
+    import seaborn as sns
+    fig = Figure(figsize=(7, 4.6))
+    axes = fig.subplots(2, 2)
+
+    labels, values = bar_key
+    ax = axes[0, 0]
+    ax.bar(labels, values, color="#FFB74D")
+    ax.set_title("Total Kasus Terbaru")
+    ax.grid(axis="y", linestyle="--", alpha=0.4)
+    ax.tick_params(axis="x", rotation=15)
+
+    labels, cases, deaths = scat_key
+    ax = axes[0, 1]
+    ax.scatter(cases, deaths, color="#64B5F6")
+    for prov, x, y in zip(labels, cases, deaths):
+        ax.annotate(prov, (x, y), fontsize=7)
+    ax.set_title("Kasus vs Kematian")
+    ax.grid(True, linestyle="--", alpha=0.4)
+
+    labels, values = pie_key
+    ax = axes[1, 0]
+    ax.pie(values, labels=labels, autopct="%1.1f%%", startangle=140,
+           colors=sns.color_palette("Pastel1", n_colors=len(values)), textprops={'fontsize': 7})
+    ax.set_title("Proporsi Total Kasus")
+
+    dates_key, values = area_key
+    ax = axes[1, 1]
+    ax.fill_between(list(dates_key), values, color="#E57373", alpha=0.35)
+    ax.set_title("Kasus Nasional per Hari")
+    ax.grid(True, linestyle="--", alpha=0.4)
+    ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%b\n%y'))
+    ax.tick_params(axis="x", labelsize=6)
+
+    fig.tight_layout()
+    return fig
+
+def render_compact():
+    bar_data = latest["Total Cases"].fillna(0)
+    if bar_data.empty:
+        return
+    scat_df = latest[["Total Cases", "Total Deaths"]].dropna()
+    pie_df = latest["Total Cases"].dropna()
+    area_df = national_daily_total(start_date, end_date, tuple(provinces))
+    fig = build_compact_fig(
+        (tuple(bar_data.index), tuple(bar_data.values)),
+        (tuple(scat_df.index), tuple(scat_df["Total Cases"]), tuple(scat_df["Total Deaths"])),
+        (tuple(pie_df.index), tuple(pie_df.values)),
+        (tuple(area_df.index), tuple(area_df.values)),
+    )
+    st.pyplot(fig, clear_figure=False)
+
+# Registri grafik: (kunci session_state, judul expander, terbuka default, renderer)
+CHARTS = [
+    ("bar", "📊 Total Kasus per Provinsi", True, render_bar),
+    ("scatter", "🔵 Scatter Plot Kasus vs Kematian", False, render_scatter),
+    ("pie", "🟣 Pie Chart Total Kasus", False, render_pie),
+    ("area", "🟥 Tren Total Kasus Harian (Nasional)", False, render_area),
+    ("pie_rec", "🍃 Distribusi Total Pasien Sembuh per Provinsi", False, render_pie_rec),
+    ("heatmap", "🔥 Heatmap Korelasi Variabel", False, render_heatmap),
+]
 
-# GRAFIK 
 show_all = st.checkbox("📑 Tampilkan Grafik Gabungan", value=True)
+compact = st.checkbox("🧩 Mode Ringkas (satu gambar 2×2)", value=False)
 
 if show_all:
-
-    with st.expander("📊 Total Kasus per Provinsi", expanded=True):
-        bar_data = filtered_df.sort_values("Date").groupby("Province")["Total Cases"].last().reindex(provinces).fillna(0)
-        if not bar_data.empty:
-            fig, ax = plt.subplots(figsize=(3.5, 2.2))
-            bars = ax.bar(bar_data.index, bar_data.values, color="#FFB74D")
-            ax.set_ylabel("Total Kasus (orang)")
-            ax.set_title("Total Kasus COVID-19 Terbaru")
-            ax.grid(axis="y", linestyle="--", alpha=0.4)
-            plt.xticks(rotation=15)
-            for b in bars:
-                ax.annotate(f"{int(b.get_height()):,}", (b.get_x()+b.get_width()/2, b.get_height()),
-                            textcoords="offset points", xytext=(0,3), ha='center', fontsize=7)
-            st.pyplot(fig, clear_figure=True)
-
-    with st.expander("🔵 Scatter Plot Kasus vs Kematian"):
-        if {"Total Cases", "Total Deaths"}.issubset(filtered_df.columns):
-            scat_df = filtered_df.sort_values("Date").groupby("Province")[["Total Cases", "Total Deaths"]].last().reindex(provinces).dropna()
-            if not scat_df.empty:
-                fig, ax = plt.subplots(figsize=(3.5, 2.2))
-                ax.scatter(scat_df["Total Cases"], scat_df["Total Deaths"], color="#64B5F6")
-                for prov, row in scat_df.iterrows():
-                    ax.annotate(prov, (row["Total Cases"], row["Total Deaths"]), fontsize=7)
-                ax.set_xlabel("Total Kasus")
-                ax.set_ylabel("Total Kematian")
-                ax.set_title("Total Kasus vs Total Kematian")
-                ax.grid(True, linestyle="--", alpha=0.4)
-                st.pyplot(fig, clear_figure=True)
-
-    with st.expander("🟣 Pie Chart Total Kasus"):
-        pie_df = filtered_df.sort_values("Date").groupby("Province")["Total Cases"].last().reindex(provinces).dropna()
-        if not pie_df.empty:
-            fig, ax = plt.subplots(figsize=(2.8, 2.8))
-            ax.pie(pie_df.values, labels=pie_df.index, autopct="%1.1f%%", startangle=140,
-                   colors=sns.color_palette("Pastel1", n_colors=len(pie_df)), shadow=True, textprops={'fontsize': 7})
-            ax.set_title("Proporsi Total Kasus", fontsize=9)
-            ax.axis("equal")
-            st.pyplot(fig, clear_figure=True)
-
-    with st.expander("🟥 Tren Total Kasus Harian (Nasional)"):
-        if "Total Cases" in filtered_df.columns:
-            area_df = filtered_df.groupby("Date")["Total Cases"].sum().sort_index()
-            if not area_df.empty:
-                fig, ax = plt.subplots(figsize=(4, 2.3))
-                ax.fill_between(area_df.index, area_df.values, color="#E57373", alpha=0.35)
-                ax.set_title("Total Kasus Nasional per Hari")
-                ax.set_xlabel("Tanggal")
-                ax.set_ylabel("Total Kasus")
-                ax.grid(True, linestyle="--", alpha=0.4)
-                ax.xaxis.set_major_locator(mdates.AutoDateLocator())
-                ax.xaxis.set_major_formatter(mdates.DateFormatter('%b\n%Y'))
-                fig.autofmt_xdate(rotation=15, ha='center')
-                st.pyplot(fig, clear_figure=True)
-
-    with st.expander("🍃 Distribusi Total Pasien Sembuh per Provinsi"):
-        if {"Province", "Total Recovered"}.issubset(filtered_df.columns):
-            pie_rec_df = filtered_df.sort_values("Date").groupby("Province")["Total Recovered"].last().reindex(provinces).dropna()
-            if not pie_rec_df.empty:
-                fig, ax = plt.subplots(figsize=(2.8, 2.8))
-                wedges, texts, autotexts = ax.pie(pie_rec_df.values, labels=pie_rec_df.index, autopct='%1.1f%%',
-                                                  startangle=140, explode=[0.05]*len(pie_rec_df),
-                                                  colors=sns.color_palette("Set3", n_colors=len(pie_rec_df)),
-                                                  shadow=True, textprops={'fontsize': 7})
-                for autotext in autotexts:
-                    autotext.set_color('black')
-                    autotext.set_fontweight('bold')
-                ax.set_title("Proporsi Total Pasien Sembuh", fontsize=9, color="#388E3C")
-                ax.axis("equal")
-                st.pyplot(fig, clear_figure=True)
-
-    with st.expander("🔥 Heatmap Korelasi Variabel"):
-        cols = [c for c in ["New Cases", "New Deaths", "New Recovered", "Total Cases",
-                            "Total Deaths", "Total Recovered", "Total Active Cases"] if c in filtered_df.columns]
-        corr_df = filtered_df[cols].dropna()
-        if not corr_df.empty and len(cols) >= 2:
-            fig, ax = plt.subplots(figsize=(3.5, 2.5))
-            sns.heatmap(corr_df.corr(), annot=True, cmap="YlGnBu", linewidths=0.5, ax=ax)
-            st.pyplot(fig, clear_figure=True)
+    if compact:
+        # Bar+scatter+pie+area digambar ke satu Figure: satu kali konstruksi
+        # figure dan satu gambar yang dikirim ke browser, bukan empat
+        render_compact()
+        charts = [c for c in CHARTS if c[0] in ("pie_rec", "heatmap")]
+    else:
+        charts = CHARTS
+    for name, title, expanded, render in charts:
+        with st.expander(title, expanded=expanded):
+            # Grafik yang dimatikan lewat toggle ini tidak dihitung ulang
+            # sama sekali saat widget lain berubah
+            if st.checkbox("Muat grafik", value=True, key=f"open_{name}"):
+                render()
 
 # TABEL DATA 
 with st.expander("📋 Data Tabel Kasus Harian per Provinsi"):
     if not filtered_df.empty:
         tab_titles = [prov for prov in provinces]
         tabs = st.tabs(tab_titles)
+        cols_show = ["Province", "New Cases", "New Deaths", "New Recovered"]
+        # Satu pass groupby → dict; tiap tab tinggal lookup, tanpa scan ulang
+        per_prov = {prov: g for prov, g in
+                    filtered_df.groupby("Province", observed=True, sort=False)[cols_show]}
+        empty_df = filtered_df.iloc[0:0][cols_show]
         for tab, prov in zip(tabs, provinces):
             with tab:
                 st.subheader(f"Data Kasus Harian – {prov}")
-                cols_show = ["Date", "Province", "New Cases", "New Deaths", "New Recovered"]
-                show_df = (filtered_df[filtered_df["Province"] == prov][cols_show]
-                           .sort_values("Date").reset_index(drop=True))
-                st.dataframe(show_df, use_container_width=True)
+                show_df = per_prov.get(prov, empty_df).reset_index()
+                # Kirim hanya 60 baris terakhir ke browser; riwayat lengkap
+                # tetap bisa diunduh sebagai CSV
+                st.dataframe(show_df.tail(60), use_container_width=True)
+                if len(show_df) > 60:
+                    st.caption(f"Menampilkan 60 dari {len(show_df)} baris.")
+                st.download_button("⬇️ Unduh CSV lengkap",
+                                   show_df.to_csv(index=False).encode(),
+                                   file_name=f"{prov}.csv", mime="text/csv",
+                                   key=f"dl_{prov}")
 
 # FOOTER
 st.markdown("📌 *Sumber data:* `covid_19_indonesia_clean.csv`")